@@ -1,14 +1,58 @@
 from flask import Flask
 from flask_cors import CORS
 from routes.test import test_bp
-from routes.skills import skills_bp
+from routes.skills import build_skill_graph, init_skills
+from models.progress_store import ProgressStore
 
-app = Flask(__name__)
-CORS(app)
+DEFAULT_CONFIG = {
+    # Zero-argument factories for the skill graph and progress store; both
+    # are called on first use rather than at startup
+    "SKILL_GRAPH_FACTORY": build_skill_graph,
+    "PROGRESS_STORE_FACTORY": ProgressStore,
+    # Build the graph in a background thread as soon as the app is created
+    "WARM_SKILL_GRAPH": False,
+    # Per-user token bucket: burst size and tokens per second
+    "RATE_LIMIT_CAPACITY": 20,
+    "RATE_LIMIT_REFILL": 10,
+    # Per-IP token bucket, shared by every user behind one address (a school
+    # NAT, a proxy). Behind a reverse proxy, wrap app.wsgi_app in
+    # werkzeug.middleware.proxy_fix.ProxyFix so remote_addr is the client.
+    "RATE_LIMIT_IP_CAPACITY": 200,
+    "RATE_LIMIT_IP_REFILL": 100,
+}
 
-# Register blueprints
-app.register_blueprint(test_bp)
-app.register_blueprint(skills_bp)
+def create_app(config=None):
+    """
+    Create and configure the Flask application
+    
+    Args:
+        config: Optional mapping overriding DEFAULT_CONFIG keys
+        
+    Returns:
+        The configured Flask app
+    """
+    app = Flask(__name__)
+    app.config.from_mapping(DEFAULT_CONFIG)
+    if config:
+        app.config.from_mapping(config)
+    CORS(app)
+    
+    # Register blueprints
+    app.register_blueprint(test_bp)
+    state = init_skills(
+        app,
+        graph_factory=app.config["SKILL_GRAPH_FACTORY"],
+        progress_factory=app.config["PROGRESS_STORE_FACTORY"],
+        rate_limit_capacity=app.config["RATE_LIMIT_CAPACITY"],
+        rate_limit_refill=app.config["RATE_LIMIT_REFILL"],
+        rate_limit_ip_capacity=app.config["RATE_LIMIT_IP_CAPACITY"],
+        rate_limit_ip_refill=app.config["RATE_LIMIT_IP_REFILL"],
+    )
+    
+    if app.config["WARM_SKILL_GRAPH"]:
+        state.warm()
+    
+    return app
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    create_app({"WARM_SKILL_GRAPH": True}).run(debug=True, host='0.0.0.0', port=5000)
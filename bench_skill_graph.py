@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the SkillGraph module
+"""
+
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+
+from models.skill_graph import SkillGraph
+from models.graph_validation import validate_edges
+
+def build_dense_dag(size, density, reduce_prerequisites=False, seed=42):
+    """Build a synthetic DAG where each skill requires a share of earlier skills"""
+    rng = random.Random(seed)
+    graph = SkillGraph(reduce_prerequisites=reduce_prerequisites, load_sample_data=False)
+    ids = [f"skill_{i}" for i in range(size)]
+    for i, skill_id in enumerate(ids):
+        window = ids[max(0, i - 50):i]
+        prereqs = [p for p in window if rng.random() < density]
+        graph.add_skill(skill_id, skill_id, "Synthetic skill", prereqs)
+    return graph
+
+def bench_unlock_checks(size, density, rounds=20):
+    """Compare unlock evaluation on the original and reduced edge sets"""
+    original = build_dense_dag(size, density)
+    reduced = build_dense_dag(size, density, reduce_prerequisites=True)
+
+    start = time.perf_counter()
+    reduced_edges = reduced.get_unlock_edges()
+    reduction_time = time.perf_counter() - start
+
+    original_count = sum(len(s.prerequisites) for s in original.get_all_skills())
+    reduced_count = sum(len(p) for p in reduced_edges.values())
+
+    # Completed sets are prefixes of the topological order, as produced by
+    # the progress endpoint
+    ids = [s.id for s in original.get_all_skills()]
+    samples = [ids[:cut] for cut in range(0, size, max(1, size // rounds))]
+
+    timings = {}
+    for label, graph in (("original", original), ("reduced", reduced)):
+        start = time.perf_counter()
+        results = [graph.get_unlockable_skills(completed, closed=True) for completed in samples]
+        timings[label] = time.perf_counter() - start
+        timings[label + "_ids"] = [[s.id for s in r] for r in results]
+
+    assert timings["original_ids"] == timings["reduced_ids"], "reduced edges changed unlock results"
+
+    # Arbitrary client-supplied sets are not closed and must fall back to
+    # the original edges
+    rng = random.Random(size)
+    for _ in range(rounds):
+        completed = rng.sample(ids, rng.randrange(size))
+        expected = [s.id for s in original.get_unlockable_skills(completed)]
+        assert [s.id for s in reduced.get_unlockable_skills(completed)] == expected, \
+            "reduced edges used for a non-closed completed set"
+
+    print(f"size={size} density={density}")
+    print(f"   edges: {original_count} -> {reduced_count}")
+    print(f"   reduction: {reduction_time * 1000:.1f} ms")
+    print(f"   unlock checks: original {timings['original'] * 1000:.1f} ms, "
+          f"reduced {timings['reduced'] * 1000:.1f} ms")
+    print()
+
+def build_edge_map(size, degree, window=50, seed=7):
+    """Build a single-component prerequisite map with about size * degree edges"""
+    rng = random.Random(seed)
+    ids = [f"skill_{i}" for i in range(size)]
+    edges = {}
+    for i, skill_id in enumerate(ids):
+        edges[skill_id] = rng.sample(ids[max(0, i - window):i], min(i, degree))
+    return edges
+
+def bench_validate(size=125_000, degree=8, check_redundant=True):
+    """Validate a million-edge catalog and report time and peak memory"""
+    edges = build_edge_map(size, degree)
+    start = time.perf_counter()
+    report = validate_edges(edges, check_redundant=check_redundant)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"skills={size} edges={sum(len(p) for p in edges.values())} check_redundant={check_redundant}")
+    print(f"   validate: {elapsed:.2f} s, peak RSS: {peak_mb:.0f} MB")
+    print(f"   cycles: {len(report.cycles)}, redundant edges: {len(report.redundant_edges)}")
+    print()
+
+def bench_burst_load(threads=32, requests_per_thread=20):
+    """Fire overlapping /unlockable calls and report the work saved"""
+    from app import create_app
+
+    # A larger catalog makes each scan slow enough for calls to overlap
+    app = create_app({
+        "SKILL_GRAPH_FACTORY": lambda: build_dense_dag(5000, 0.3, reduce_prerequisites=True),
+        "RATE_LIMIT_CAPACITY": 100,
+    })
+    client = app.test_client()
+    # Give the users recorded progress so calls coalesce on (user, version)
+    with app.app_context():
+        from routes.skills import get_state
+        for n in range(4):
+            get_state().progress.record_completion(f"user_{n}", "skill_0", 50)
+    status_counts = {}
+    lock = threading.Lock()
+
+    def worker(n):
+        user_id = f"user_{n % 4}"
+        for _ in range(requests_per_thread):
+            response = client.post("/unlockable", json={"user_id": user_id, "completed_skills": []})
+            with lock:
+                status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    stats = client.get("/throttle_stats").get_json()
+    print(f"threads={threads} requests={threads * requests_per_thread} in {elapsed * 1000:.0f} ms")
+    print(f"   status codes: {status_counts}")
+    print(f"   rate limiter: {stats['rate_limiter']}")
+    print(f"   coalescing: {stats['unlockable_coalescing']}")
+    print()
+
+STARTUP_PROBE = """
+import time
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app({config})
+created = time.perf_counter()
+response = app.test_client().post("/unlockable", json={{"completed_skills": []}})
+assert response.status_code == 200
+first = time.perf_counter()
+response = app.test_client().post("/unlockable", json={{"completed_skills": ["basics"]}})
+second = time.perf_counter()
+print(imported - start, created - imported, first - created, second - first)
+"""
+
+def bench_startup(config="None"):
+    """Measure import, app creation and first-request latency in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_PROBE.format(config=config)],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    imported, created, first, second = (float(value) * 1000 for value in output)
+    print(f"config={config}")
+    print(f"   import: {imported:.1f} ms, create_app: {created:.1f} ms")
+    print(f"   first request: {first:.1f} ms, second request: {second:.1f} ms")
+    print()
+
+if __name__ == "__main__":
+    print("=== Transitive Reduction Benchmark ===\n")
+    for size, density in ((1000, 0.3), (5000, 0.5), (5000, 0.9)):
+        bench_unlock_checks(size, density)
+
+    print("=== Validation Benchmark ===\n")
+    bench_validate(check_redundant=False)
+    bench_validate()
+
+    print("=== Burst Load Test ===\n")
+    bench_burst_load()
+
+    print("=== Startup Latency ===\n")
+    bench_startup()
+    large = "{'SKILL_GRAPH_FACTORY': lambda: __import__('bench_skill_graph').build_dense_dag(5000, 0.5, True)}"
+    bench_startup(large)
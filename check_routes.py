@@ -3,7 +3,9 @@
 Script to check Flask app routes
 """
 
-from app import app
+from app import create_app
+
+app = create_app()
 
 print("=== Flask App URL Map ===")
 print(app.url_map)
@@ -0,0 +1,218 @@
+import threading
+import time
+from typing import List, Dict, Optional, Tuple
+
+SECONDS_PER_DAY = 86400
+
+def day_number(timestamp: float) -> int:
+    """Convert a Unix timestamp to a UTC day number"""
+    return int(timestamp // SECONDS_PER_DAY)
+
+def week_number(day: int) -> int:
+    """Convert a day number to a week number (weeks start on Monday)"""
+    # Day 0 (1970-01-01) was a Thursday
+    return (day + 3) // 7
+
+class RingBuckets:
+    """
+    Fixed-size ring of (points, skills) counters, one slot per period
+
+    Slots are tagged with the period they hold, so stale slots are reset
+    lazily when a period wraps around instead of on a timer.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._periods: List[int] = [-1] * size
+        self._points: List[int] = [0] * size
+        self._skills: List[int] = [0] * size
+
+    def add(self, period: int, points: int) -> None:
+        """
+        Add one completion worth `points` to the given period
+
+        Args:
+            period: Day or week number of the completion
+            points: Points awarded for the completion
+        """
+        slot = period % self.size
+        if self._periods[slot] != period:
+            if self._periods[slot] > period:
+                # Older than anything the ring still covers
+                return
+            self._periods[slot] = period
+            self._points[slot] = 0
+            self._skills[slot] = 0
+        self._points[slot] += points
+        self._skills[slot] += 1
+
+    def window(self, current: int, length: int) -> Tuple[int, int]:
+        """
+        Sum the last `length` periods up to and including `current`
+
+        Args:
+            current: The most recent period in the window
+            length: Number of periods to include (at most the ring size)
+
+        Returns:
+            Tuple of (points, skills) in the window
+        """
+        points = skills = 0
+        for period in range(current - min(length, self.size) + 1, current + 1):
+            slot = period % self.size
+            if self._periods[slot] == period:
+                points += self._points[slot]
+                skills += self._skills[slot]
+        return points, skills
+
+class UserActivity:
+    """Per-user completion timestamps, streaks and windowed aggregates"""
+
+    def __init__(self, daily_size: int = 31, weekly_size: int = 12):
+        self.completed_at: Dict[str, float] = {}
+        self.daily = RingBuckets(daily_size)
+        self.weekly = RingBuckets(weekly_size)
+        self.last_active_day: Optional[int] = None
+        self.current_streak = 0
+        self.longest_streak = 0
+
+    def record(self, skill_id: str, points: int, timestamp: float) -> None:
+        """Record a completion and update streaks and buckets in O(1)"""
+        day = day_number(timestamp)
+        self.completed_at[skill_id] = timestamp
+        self.daily.add(day, points)
+        self.weekly.add(week_number(day), points)
+
+        if self.last_active_day is None or day > self.last_active_day + 1:
+            self.current_streak = 1
+        elif day == self.last_active_day + 1:
+            self.current_streak += 1
+        else:
+            # Same day, or a late-arriving earlier completion
+            return
+        self.last_active_day = day
+        self.longest_streak = max(self.longest_streak, self.current_streak)
+
+    def streak(self, today: int) -> int:
+        """Current streak as of `today`; a missed day resets it to zero"""
+        if self.last_active_day is None or today > self.last_active_day + 1:
+            return 0
+        return self.current_streak
+
+class TrendingWindow:
+    """Global rolling window of per-skill completion counts"""
+
+    def __init__(self, days: int = 7):
+        self.days = days
+        self._buckets: List[Dict[str, int]] = [{} for _ in range(days)]
+        self._periods: List[int] = [-1] * days
+        self._totals: Dict[str, int] = {}
+
+    def _expire(self, slot: int, day: int) -> None:
+        """Subtract an outdated day's counts from the running totals"""
+        for skill_id, count in self._buckets[slot].items():
+            remaining = self._totals[skill_id] - count
+            if remaining:
+                self._totals[skill_id] = remaining
+            else:
+                del self._totals[skill_id]
+        self._buckets[slot] = {}
+        self._periods[slot] = day
+
+    def _advance(self, today: int) -> None:
+        """Expire every slot that has fallen out of the window"""
+        for slot, period in enumerate(self._periods):
+            if period != -1 and period <= today - self.days:
+                self._expire(slot, -1)
+
+    def add(self, skill_id: str, day: int) -> None:
+        """Count one completion of a skill on the given day"""
+        slot = day % self.days
+        if self._periods[slot] != day:
+            if self._periods[slot] > day:
+                return
+            self._expire(slot, day)
+        bucket = self._buckets[slot]
+        bucket[skill_id] = bucket.get(skill_id, 0) + 1
+        self._totals[skill_id] = self._totals.get(skill_id, 0) + 1
+
+    def top(self, today: int, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        Get the most completed skills in the window ending `today`
+
+        Args:
+            today: The current day number
+            limit: Maximum number of skills to return
+
+        Returns:
+            List of (skill ID, completions) pairs, most completed first
+        """
+        self._advance(today)
+        ranked = sorted(self._totals.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+class ActivityTracker:
+    """Timestamped completion recording with streaks and windowed points"""
+
+    def __init__(self, trending_days: int = 7):
+        self.users: Dict[str, UserActivity] = {}
+        self.trending = TrendingWindow(trending_days)
+        self._lock = threading.Lock()
+
+    def record_completion(self, user_id: str, skill_id: str, points: int, timestamp: Optional[float] = None) -> float:
+        """
+        Record a skill completion for a user
+
+        Args:
+            user_id: The user who completed the skill
+            skill_id: The completed skill
+            points: Points awarded for the completion
+            timestamp: Unix time of the completion (defaults to now)
+
+        Returns:
+            The timestamp that was recorded
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        with self._lock:
+            activity = self.users.get(user_id)
+            if activity is None:
+                activity = self.users[user_id] = UserActivity()
+            activity.record(skill_id, points, timestamp)
+            self.trending.add(skill_id, day_number(timestamp))
+        return timestamp
+
+    def get_summary(self, user_id: str, now: Optional[float] = None) -> Dict:
+        """
+        Get streaks and windowed aggregates for a user
+
+        Reads only the fixed-size buckets, never the completion history.
+
+        Args:
+            user_id: The user to summarise
+            now: Unix time to evaluate windows at (defaults to now)
+
+        Returns:
+            Dictionary of activity statistics
+        """
+        today = day_number(time.time() if now is None else now)
+        with self._lock:
+            activity = self.users.get(user_id) or UserActivity()
+            points_today, _ = activity.daily.window(today, 1)
+            points_week, _ = activity.daily.window(today, 7)
+            points_this_week, _ = activity.weekly.window(week_number(today), 1)
+            _, skills_month = activity.daily.window(today, 30)
+            return {
+                "current_streak": activity.streak(today),
+                "longest_streak": activity.longest_streak,
+                "points_today": points_today,
+                "points_last_7_days": points_week,
+                "points_this_week": points_this_week,
+                "skills_last_30_days": skills_month,
+            }
+
+    def get_trending(self, limit: int = 5, now: Optional[float] = None) -> List[Tuple[str, int]]:
+        """Get the most completed skills in the global rolling window"""
+        today = day_number(time.time() if now is None else now)
+        with self._lock:
+            return self.trending.top(today, limit)
@@ -0,0 +1,284 @@
+from typing import List, Dict, Set, Tuple, Optional
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+
+# Graphs with fewer edges than this are validated inline; spinning up a
+# process pool costs more than it saves on small catalogs.
+PARALLEL_EDGE_THRESHOLD = 50_000
+
+
+@dataclass
+class ValidationReport:
+    """Result of validating a skill graph"""
+    cycles: List[List[str]] = field(default_factory=list)
+    missing_prerequisites: List[Tuple[str, str]] = field(default_factory=list)
+    unreachable: List[str] = field(default_factory=list)
+    orphaned: List[str] = field(default_factory=list)
+    duplicates: List[str] = field(default_factory=list)
+    shadowed: List[str] = field(default_factory=list)
+    shadowed_names: Dict[str, List[str]] = field(default_factory=dict)
+    redundant_edges: List[Tuple[str, str]] = field(default_factory=list)
+    components: int = 0
+
+    @property
+    def is_valid(self) -> bool:
+        """True when the graph has no structural errors (warnings are allowed)"""
+        return not (self.cycles or self.missing_prerequisites or self.unreachable)
+
+    def to_dict(self) -> Dict:
+        """Convert the report to a JSON-serialisable dictionary"""
+        return {
+            "valid": self.is_valid,
+            "components": self.components,
+            "cycles": self.cycles,
+            "missing_prerequisites": [list(edge) for edge in self.missing_prerequisites],
+            "unreachable": self.unreachable,
+            "orphaned": self.orphaned,
+            "duplicates": self.duplicates,
+            "shadowed": self.shadowed,
+            "shadowed_names": self.shadowed_names,
+            "redundant_edges": [list(edge) for edge in self.redundant_edges],
+        }
+
+
+def weakly_connected_components(edges: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Split a prerequisite map into weakly connected components
+
+    Args:
+        edges: Mapping of skill ID to its prerequisite IDs
+
+    Returns:
+        List of components, each a list of skill IDs
+    """
+    parent: Dict[str, str] = {node: node for node in edges}
+
+    def find(node: str) -> str:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for node, prereqs in edges.items():
+        for prereq in prereqs:
+            if prereq not in parent:
+                continue
+            root_a, root_b = find(node), find(prereq)
+            if root_a != root_b:
+                parent[root_a] = root_b
+
+    groups: Dict[str, List[str]] = {}
+    for node in edges:
+        groups.setdefault(find(node), []).append(node)
+    return list(groups.values())
+
+
+def strongly_connected_components(edges: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Find strongly connected components with an iterative Tarjan traversal
+
+    Args:
+        edges: Mapping of skill ID to its prerequisite IDs
+
+    Returns:
+        List of components, each a list of skill IDs
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for start in edges:
+        if start in index:
+            continue
+        work = [(start, iter(edges[start]))]
+        index[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in edges:
+                    continue
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges[child])))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent_node = work[-1][0]
+                lowlink[parent_node] = min(lowlink[parent_node], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def topological_order(edges: Dict[str, List[str]]) -> List[str]:
+    """
+    Order skills so every prerequisite comes before its dependents
+
+    Skills that can never be unlocked (they sit on a cycle, depend on one,
+    or depend on a missing skill) are left out of the result.
+
+    Args:
+        edges: Mapping of skill ID to its prerequisite IDs
+
+    Returns:
+        List of skill IDs in unlock order
+    """
+    pending: Dict[str, int] = {}
+    dependents: Dict[str, List[str]] = {node: [] for node in edges}
+    for node, prereqs in edges.items():
+        unique = set(prereqs)
+        if any(prereq not in edges for prereq in unique):
+            # A missing prerequisite can never be satisfied
+            pending[node] = -1
+            continue
+        pending[node] = len(unique)
+        for prereq in unique:
+            dependents[prereq].append(node)
+
+    order = [node for node, count in pending.items() if count == 0]
+    for node in order:
+        for dependent in dependents[node]:
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                order.append(dependent)
+    return order
+
+
+def redundant_edges(edges: Dict[str, List[str]], order: List[str]) -> List[Tuple[str, str]]:
+    """
+    Find prerequisite edges already implied by another prerequisite
+
+    Ancestors are tracked as integer bitsets over the topological order. A
+    skill's bitset is dropped as soon as its last dependent has been
+    processed, so only the current frontier is held in memory.
+
+    Args:
+        edges: Mapping of skill ID to its prerequisite IDs
+        order: Topological order of the skills to inspect
+
+    Returns:
+        List of (prerequisite ID, skill ID) pairs that can be dropped
+    """
+    position = {node: i for i, node in enumerate(order)}
+    remaining: Dict[str, int] = dict.fromkeys(order, 0)
+    for node in order:
+        for prereq in set(edges[node]):
+            remaining[prereq] += 1
+
+    ancestors: Dict[str, int] = {}
+    redundant = []
+    for node in order:
+        prereqs = list(dict.fromkeys(edges[node]))
+        implied = 0
+        for prereq in prereqs:
+            implied |= ancestors[prereq]
+        bits = implied
+        for prereq in prereqs:
+            if implied >> position[prereq] & 1:
+                redundant.append((prereq, node))
+            bits |= 1 << position[prereq]
+            remaining[prereq] -= 1
+            if not remaining[prereq]:
+                del ancestors[prereq]
+        if remaining[node]:
+            ancestors[node] = bits
+    return redundant
+
+
+def _validate_component(edges: Dict[str, List[str]], check_redundant: bool = True) -> Dict:
+    """Run the per-component checks; must stay picklable for the process pool"""
+    cycles = [
+        sorted(component) for component in strongly_connected_components(edges)
+        if len(component) > 1 or component[0] in edges[component[0]]
+    ]
+    missing = [
+        (prereq, node) for node, prereqs in edges.items()
+        for prereq in prereqs if prereq not in edges
+    ]
+    order = topological_order(edges)
+    unlockable = set(order)
+    return {
+        "cycles": cycles,
+        "missing_prerequisites": missing,
+        "unreachable": [node for node in edges if node not in unlockable],
+        "redundant_edges": redundant_edges(edges, order) if check_redundant else [],
+    }
+
+
+def validate_edges(
+    edges: Dict[str, List[str]],
+    workers: Optional[int] = None,
+    parallel: Optional[bool] = None,
+    check_redundant: bool = True,
+) -> ValidationReport:
+    """
+    Validate the structure of a prerequisite map
+
+    Independent weakly connected components are checked in a process pool
+    once the graph is large enough for that to pay off. A catalog that forms
+    a single component is checked in one process.
+
+    Args:
+        edges: Mapping of skill ID to its prerequisite IDs
+        workers: Maximum number of worker processes (defaults to CPU count)
+        parallel: Force (True) or disable (False) the process pool;
+            None picks based on PARALLEL_EDGE_THRESHOLD
+        check_redundant: Also look for prerequisites implied by another
+            prerequisite, the most expensive check
+
+    Returns:
+        ValidationReport describing structural problems in the graph
+    """
+    components = weakly_connected_components(edges)
+    # Missing prerequisites are kept on the edge list so each component can
+    # report them; they never join two components together.
+    chunks = [{node: edges[node] for node in component} for component in components]
+
+    if parallel is None:
+        parallel = len(chunks) > 1 and sum(len(p) for p in edges.values()) >= PARALLEL_EDGE_THRESHOLD
+
+    if parallel:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                _validate_component, chunks, [check_redundant] * len(chunks),
+                chunksize=max(1, len(chunks) // 64)
+            ))
+    else:
+        results = [_validate_component(chunk, check_redundant) for chunk in chunks]
+
+    report = ValidationReport(components=len(components))
+    for result in results:
+        report.cycles.extend(result["cycles"])
+        report.missing_prerequisites.extend(result["missing_prerequisites"])
+        report.unreachable.extend(result["unreachable"])
+        report.redundant_edges.extend(result["redundant_edges"])
+
+    dependents: Set[str] = {prereq for prereqs in edges.values() for prereq in prereqs}
+    if len(edges) > 1:
+        report.orphaned = [node for node, prereqs in edges.items() if not prereqs and node not in dependents]
+    return report
@@ -0,0 +1,55 @@
+import threading
+from typing import List, Dict, Optional
+from models.activity import ActivityTracker
+
+class ProgressStore:
+    """In-memory store of completed skills per user"""
+
+    def __init__(self):
+        self.completed: Dict[str, List[str]] = {}
+        # Bumped on every completion so cached or coalesced results can be
+        # keyed by (user_id, version)
+        self.versions: Dict[str, int] = {}
+        self.activity = ActivityTracker()
+        self._lock = threading.Lock()
+
+    def get_completed(self, user_id: str) -> Optional[List[str]]:
+        """
+        Get the skills a user has completed
+
+        Args:
+            user_id: The user to look up
+
+        Returns:
+            List of completed skill IDs, or None for an unknown user
+        """
+        return self.completed.get(user_id)
+
+    def get_version(self, user_id: str) -> int:
+        """Get the progress version of a user (0 for an unknown user)"""
+        return self.versions.get(user_id, 0)
+
+    def record_completion(self, user_id: str, skill_id: str, points: int) -> Optional[float]:
+        """
+        Mark a skill as completed for a user
+
+        The duplicate check and the append happen under one lock, so
+        overlapping requests for the same skill record it (and award its
+        points) only once.
+
+        Args:
+            user_id: The user who completed the skill
+            skill_id: The completed skill
+            points: Points awarded for the completion
+
+        Returns:
+            The timestamp of the completion, or None if the user had
+            already completed the skill
+        """
+        with self._lock:
+            completed = self.completed.setdefault(user_id, [])
+            if skill_id in completed:
+                return None
+            completed.append(skill_id)
+            self.versions[user_id] = self.versions.get(user_id, 0) + 1
+        return self.activity.record_completion(user_id, skill_id, points)
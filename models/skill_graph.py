@@ -1,5 +1,6 @@
 from typing import List, Dict, Set, Optional
 from dataclasses import dataclass
+from models.graph_validation import ValidationReport, validate_edges, topological_order, redundant_edges
 
 @dataclass
 class Skill:
@@ -12,9 +13,27 @@ class Skill:
 class SkillGraph:
     """A directed graph representing skill dependencies"""
     
-    def __init__(self):
+    def __init__(self, reduce_prerequisites: bool = False, load_sample_data: bool = True):
+        """
+        Args:
+            reduce_prerequisites: Evaluate unlocks of closed completed sets
+                (see get_unlockable_skills) against the transitive reduction
+                of the prerequisite edges. Skill.prerequisites is left
+                untouched for display. The reduction is cached, so edges
+                must only change through add_skill() while this is on;
+                editing a Skill.prerequisites list in place leaves the
+                cache stale.
+            load_sample_data: Seed the graph with the built-in sample skills
+        """
         self.skills: Dict[str, Skill] = {}
-        self._initialize_sample_data()
+        self.reduce_prerequisites = reduce_prerequisites
+        self._reduced_prerequisites: Optional[Dict[str, List[str]]] = None
+        # IDs registered more than once, and those whose later registration
+        # replaced a different definition
+        self._duplicate_ids: Set[str] = set()
+        self._shadowed_ids: Set[str] = set()
+        if load_sample_data:
+            self._initialize_sample_data()
     
     def add_skill(self, id: str, name: str, description: str, prerequisites: List[str] = []) -> None:
         """
@@ -31,12 +50,20 @@ class SkillGraph:
             if prereq_id not in self.skills:
                 raise ValueError(f"Prerequisite skill '{prereq_id}' does not exist")
         
-        self.skills[id] = Skill(
+        skill = Skill(
             id=id,
             name=name,
             description=description,
             prerequisites=prerequisites.copy()
         )
+        existing = self.skills.get(id)
+        if existing is not None:
+            self._duplicate_ids.add(id)
+            if existing != skill:
+                self._shadowed_ids.add(id)
+        
+        self.skills[id] = skill
+        self._reduced_prerequisites = None
     
     def get_skill(self, id: str) -> Optional[Skill]:
         """
@@ -59,18 +86,22 @@ class SkillGraph:
         """
         return list(self.skills.values())
     
-    def get_unlockable_skills(self, completed_skills: List[str]) -> List[Skill]:
+    def get_unlockable_skills(self, completed_skills: List[str], closed: bool = False) -> List[Skill]:
         """
         Get skills that can be unlocked based on completed skills
         
         Args:
             completed_skills: List of skill IDs that have been completed
+            closed: The completed set already contains every prerequisite of
+                its skills (e.g. it was built through the progress endpoint).
+                Only closed sets may be checked against the reduced edges.
             
         Returns:
             List of Skill objects that can now be unlocked
         """
         unlockable = []
         completed_set = set(completed_skills)
+        reduced = self.get_unlock_edges() if self.reduce_prerequisites and closed else None
         
         for skill in self.skills.values():
             # Skip if already completed
@@ -78,11 +109,64 @@ class SkillGraph:
                 continue
             
             # Check if all prerequisites are satisfied
-            if all(prereq in completed_set for prereq in skill.prerequisites):
+            prereqs = reduced[skill.id] if reduced is not None else skill.prerequisites
+            if all(prereq in completed_set for prereq in prereqs):
                 unlockable.append(skill)
         
         return unlockable
     
+    def can_unlock(self, skill_id: str, completed_skills: List[str], closed: bool = False) -> bool:
+        """
+        Check whether a skill's prerequisites are all completed
+        
+        Args:
+            skill_id: The ID of the skill to check
+            completed_skills: List of skill IDs that have been completed
+            closed: The completed set is closed under prerequisites
+                (see get_unlockable_skills)
+            
+        Returns:
+            True if the skill exists and every prerequisite is completed
+        """
+        skill = self.skills.get(skill_id)
+        if not skill:
+            return False
+        prereqs = self.get_unlock_edges()[skill_id] if self.reduce_prerequisites and closed else skill.prerequisites
+        completed_set = set(completed_skills)
+        return all(prereq in completed_set for prereq in prereqs)
+    
+    def get_unlock_edges(self) -> Dict[str, List[str]]:
+        """
+        Get the prerequisite edges used for unlock evaluation
+        
+        The reduction is cached until the next add_skill() call.
+        
+        Returns:
+            Mapping of skill ID to prerequisite IDs; the transitive reduction
+            when reduce_prerequisites is enabled, the original edges otherwise
+        """
+        if not self.reduce_prerequisites:
+            return {skill_id: skill.prerequisites for skill_id, skill in self.skills.items()}
+        if self._reduced_prerequisites is None:
+            self._reduced_prerequisites = self.transitive_reduction()
+        return self._reduced_prerequisites
+    
+    def transitive_reduction(self) -> Dict[str, List[str]]:
+        """
+        Compute the transitive reduction of the prerequisite edges
+        
+        Skills on or behind a cycle keep their original prerequisites.
+        
+        Returns:
+            Mapping of skill ID to its non-redundant prerequisite IDs
+        """
+        edges = {skill_id: skill.prerequisites for skill_id, skill in self.skills.items()}
+        redundant = set(redundant_edges(edges, topological_order(edges)))
+        return {
+            skill_id: [prereq for prereq in dict.fromkeys(prereqs) if (prereq, skill_id) not in redundant]
+            for skill_id, prereqs in edges.items()
+        }
+    
     def get_prerequisites(self, skill_id: str) -> List[Skill]:
         """
         Get all prerequisite skills for a given skill
@@ -116,6 +200,39 @@ class SkillGraph:
         
         return dependents
     
+    def validate(
+        self,
+        workers: Optional[int] = None,
+        parallel: Optional[bool] = None,
+        check_redundant: bool = True,
+    ) -> ValidationReport:
+        """
+        Check the graph for structural problems
+        
+        Detects cycles, missing prerequisites, skills that can never be
+        unlocked, orphaned skills, duplicate or shadowed registrations and
+        prerequisites already implied by another prerequisite.
+        
+        Args:
+            workers: Maximum number of worker processes for large graphs
+            parallel: Force (True) or disable (False) the process pool
+            check_redundant: Also look for implied prerequisites
+            
+        Returns:
+            ValidationReport describing any problems found
+        """
+        edges = {skill_id: skill.prerequisites for skill_id, skill in self.skills.items()}
+        report = validate_edges(edges, workers=workers, parallel=parallel, check_redundant=check_redundant)
+        
+        report.duplicates = sorted(self._duplicate_ids)
+        report.shadowed = sorted(self._shadowed_ids)
+        by_name: Dict[str, List[str]] = {}
+        for skill in self.skills.values():
+            by_name.setdefault(skill.name, []).append(skill.id)
+        report.shadowed_names = {name: ids for name, ids in by_name.items() if len(ids) > 1}
+        
+        return report
+    
     def _initialize_sample_data(self) -> None:
         """Initialize the graph with sample skill data"""
         sample_skills = [
@@ -160,5 +277,13 @@ class SkillGraph:
                 prerequisites=skill_data["prerequisites"]
             )
 
-# Create a global instance for easy access
-skill_graph = SkillGraph() 
\ No newline at end of file
+_skill_graph: Optional[SkillGraph] = None
+
+def __getattr__(name: str):
+    """Build the global `skill_graph` instance on first access"""
+    global _skill_graph
+    if name == "skill_graph":
+        if _skill_graph is None:
+            _skill_graph = SkillGraph()
+        return _skill_graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
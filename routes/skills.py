@@ -1,19 +1,83 @@
-from flask import Blueprint, request, jsonify
+import threading
+from flask import Blueprint, request, jsonify, current_app
 from models.skill_graph import SkillGraph
+from models.progress_store import ProgressStore
+from routes.throttling import TokenBucketLimiter, SingleFlight
 
 skills_bp = Blueprint("skills", __name__)
 
-# Initialize skill graph
-graph = SkillGraph()
-graph.add_skill("basics", "Basics of Computer", "Fundamentals of computer usage")
-graph.add_skill("ms_office", "MS Office", "Word, Excel, PowerPoint", ["basics"])
-graph.add_skill("ms_office", "MS Office", "Word, Excel, PowerPoint", ["basics"])
-graph.add_skill("canva", "Canva", "Design basics with Canva", ["basics"])
-graph.add_skill("powerbi", "Power BI", "Data visualization basics", ["ms_office", "canva"])
-graph.add_skill("ai_tools", "AI Tools", "Using AI tools for productivity", ["basics"])
+def build_skill_graph():
+    """Build the default skill catalog"""
+    graph = SkillGraph(load_sample_data=False)
+    graph.add_skill("basics", "Basics of Computer", "Fundamentals of computer usage")
+    graph.add_skill("ms_office", "MS Office", "Word, Excel, PowerPoint", ["basics"])
+    graph.add_skill("canva", "Canva", "Design basics with Canva", ["basics"])
+    graph.add_skill("powerbi", "Power BI", "Data visualization basics", ["ms_office", "canva"])
+    graph.add_skill("ai_tools", "AI Tools", "Using AI tools for productivity", ["basics"])
+    return graph
 
-# In-memory student progress tracking
-student_progress = {}
+class SkillsState:
+    """
+    Per-app dependencies of the skills routes
+
+    The graph and progress store are built by their factories on first use
+    (or by warm()), so creating the app stays cheap as the catalog grows.
+    """
+
+    def __init__(self, graph_factory=build_skill_graph, progress_factory=ProgressStore,
+                 rate_limit_capacity=20, rate_limit_refill=10,
+                 rate_limit_ip_capacity=200, rate_limit_ip_refill=100):
+        self._graph_factory = graph_factory
+        self._progress_factory = progress_factory
+        self._graph = None
+        self._progress = None
+        self._lock = threading.Lock()
+        # Per-user and per-IP rate limiting and coalescing of identical unlock
+        # scans. The IP limit is larger since many users can share an address.
+        self.rate_limiter = TokenBucketLimiter(
+            capacity=rate_limit_capacity,
+            refill_rate=rate_limit_refill,
+            kind_limits={"ip": (rate_limit_ip_capacity, rate_limit_ip_refill)},
+        )
+        self.unlockable_flight = SingleFlight()
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            with self._lock:
+                if self._graph is None:
+                    self._graph = self._graph_factory()
+        return self._graph
+
+    @property
+    def progress(self):
+        if self._progress is None:
+            with self._lock:
+                if self._progress is None:
+                    self._progress = self._progress_factory()
+        return self._progress
+
+    def warm(self):
+        """Build the graph and progress store in a background thread"""
+        def build():
+            graph = self.graph
+            if graph.reduce_prerequisites:
+                graph.get_unlock_edges()
+            self.progress
+        thread = threading.Thread(target=build, name="skills-warmup", daemon=True)
+        thread.start()
+        return thread
+
+def init_skills(app, **kwargs):
+    """Register the skills blueprint and its state on an app"""
+    state = SkillsState(**kwargs)
+    app.extensions["skills"] = state
+    app.register_blueprint(skills_bp)
+    return state
+
+def get_state():
+    """Get the skills state of the current app"""
+    return current_app.extensions["skills"]
 
 # Badge definitions
 BADGES = {
@@ -29,14 +93,69 @@ BADGES = {
     }
 }
 
+POINTS_PER_SKILL = 50
+MAX_TRENDING_LIMIT = 50
+
 def calculate_points(completed_skills):
     """Calculate points based on completed skills (50 points per skill)"""
-    return len(completed_skills) * 50
+    return len(completed_skills) * POINTS_PER_SKILL
+
+def rate_limited(user_id):
+    """
+    Return a 429 response if the caller is over its rate limit, else None
+    
+    The user and the IP are limited separately so that rotating user_id
+    values does not get around the limit. Behind a reverse proxy,
+    request.remote_addr is the proxy's address unless the app is wrapped
+    in werkzeug's ProxyFix.
+    """
+    keys = [("ip", request.remote_addr)]
+    if user_id:
+        keys.append(("user", user_id))
+    if get_state().rate_limiter.allow(*keys):
+        return None
+    return jsonify({
+        "success": False,
+        "error": "Too many requests"
+    }), 429
+
+def invalid_body():
+    """Return a 400 response for a request body that is not a JSON object"""
+    return jsonify({
+        "success": False,
+        "error": "Request body must be a JSON object"
+    }), 400
+
+def resolve_completed(state, user_id, completed_skills):
+    """
+    Pick the completed set to evaluate for an /unlockable request
+    
+    Returns a (completed_skills, coalescing_key, closed) tuple. A known
+    user's recorded progress wins over the client-supplied list, and the
+    key includes the progress version so a completion starts a new scan.
+    Only recorded progress is known to include every prerequisite, so only
+    it is marked closed.
+    """
+    user_completed = state.progress.get_completed(user_id) if user_id else None
+    if user_completed is not None:
+        return user_completed, ("user", user_id, state.progress.get_version(user_id)), True
+    return completed_skills, ("completed", frozenset(completed_skills)), False
+
+def serialize_unlockable(completed_skills, closed=False):
+    """Get unlockable skills for a completed set as response dictionaries"""
+    unlockable = []
+    for skill in get_state().graph.get_unlockable_skills(completed_skills, closed=closed):
+        unlockable.append({
+            "id": skill.id,
+            "name": skill.name,
+            "description": skill.description
+        })
+    return unlockable
 
 def calculate_badges(completed_skills):
     """Calculate badges based on user progress"""
     badges = []
-    total_skills = len(graph.get_all_skills())
+    total_skills = len(get_state().graph.get_all_skills())
     
     if len(completed_skills) >= 1:
         badges.append("FIRST_STEP")
@@ -49,7 +168,7 @@ def calculate_badges(completed_skills):
 @skills_bp.route("/", methods=["GET"])
 def get_skills():
     skills = []
-    for skill in graph.get_all_skills():
+    for skill in get_state().graph.get_all_skills():
         skills.append({
             "id": skill.id,
             "name": skill.name,
@@ -61,31 +180,39 @@ def get_skills():
 
 @skills_bp.route("/unlockable", methods=["POST"])
 def unlockable_skills():
-    data = request.get_json()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return invalid_body()
     user_id = data.get("user_id")
     completed = data.get("completed_skills", [])
     
-    # If user_id is provided, get their actual progress
-    if user_id and user_id in student_progress:
-        completed = student_progress[user_id]
+    if user_id is not None and not isinstance(user_id, str):
+        return jsonify({
+            "success": False,
+            "error": "user_id must be a string"
+        }), 400
+    if not isinstance(completed, list) or not all(isinstance(s, str) for s in completed):
+        return jsonify({
+            "success": False,
+            "error": "completed_skills must be a list of skill IDs"
+        }), 400
     
-    unlockable = []
-    for skill in graph.get_all_skills():
-        if skill.id not in completed:
-            prereqs = skill.prerequisites
-            if all(p in completed for p in prereqs):
-                unlockable.append({
-                    "id": skill.id,
-                    "name": skill.name,
-                    "description": skill.description
-                })
+    limited = rate_limited(user_id)
+    if limited:
+        return limited
+    
+    state = get_state()
+    completed, key, closed = resolve_completed(state, user_id, completed)
+    unlockable = state.unlockable_flight.do(key, lambda: serialize_unlockable(completed, closed))
     return jsonify({"success": True, "unlockable": unlockable})
 
 @skills_bp.route("/progress", methods=["POST"])
 def mark_skill_completed():
     """Mark a skill as completed for a user"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return invalid_body()
         user_id = data.get("user_id")
         skill_id = data.get("skill_id")
         
@@ -95,6 +222,19 @@ def mark_skill_completed():
                 "error": "Missing user_id or skill_id"
             }), 400
         
+        if not isinstance(user_id, str) or not isinstance(skill_id, str):
+            return jsonify({
+                "success": False,
+                "error": "user_id and skill_id must be strings"
+            }), 400
+        
+        limited = rate_limited(user_id)
+        if limited:
+            return limited
+        
+        state = get_state()
+        graph = state.graph
+        
         # Validate skill exists
         skill = graph.get_skill(skill_id)
         if not skill:
@@ -103,45 +243,41 @@ def mark_skill_completed():
                 "error": f"Skill '{skill_id}' not found"
             }), 404
         
-        # Initialize user progress if not exists
-        if user_id not in student_progress:
-            student_progress[user_id] = []
+        user_completed = state.progress.get_completed(user_id) or []
         
         # Check if skill is already completed
-        if skill_id in student_progress[user_id]:
+        if skill_id in user_completed:
             return jsonify({
                 "success": False,
                 "error": f"Skill '{skill_id}' already completed"
             }), 400
         
         # Check prerequisites
-        user_completed = student_progress[user_id]
-        if not all(prereq in user_completed for prereq in skill.prerequisites):
+        if not graph.can_unlock(skill_id, user_completed, closed=True):
             return jsonify({
                 "success": False,
                 "error": f"Prerequisites not met for skill '{skill_id}'"
             }), 400
         
         # Mark skill as completed
-        student_progress[user_id].append(skill_id)
+        completed_at = state.progress.record_completion(user_id, skill_id, POINTS_PER_SKILL)
+        if completed_at is None:
+            # An overlapping request completed it after the check above
+            return jsonify({
+                "success": False,
+                "error": f"Skill '{skill_id}' already completed"
+            }), 400
+        user_completed = state.progress.get_completed(user_id)
         
         # Get updated unlockable skills
-        unlockable = []
-        for skill in graph.get_all_skills():
-            if skill.id not in student_progress[user_id]:
-                prereqs = skill.prerequisites
-                if all(p in student_progress[user_id] for p in prereqs):
-                    unlockable.append({
-                        "id": skill.id,
-                        "name": skill.name,
-                        "description": skill.description
-                    })
+        unlockable = serialize_unlockable(user_completed, closed=True)
         
         return jsonify({
             "success": True,
             "message": f"Skill '{skill_id}' marked as completed",
             "unlockable_skills": unlockable,
-            "completed_skills": student_progress[user_id]
+            "completed_skills": user_completed,
+            "completed_at": completed_at
         }), 200
         
     except Exception as e:
@@ -154,13 +290,15 @@ def mark_skill_completed():
 def get_user_summary(user_id):
     """Get user progress summary including points and badges"""
     try:
-        if user_id not in student_progress:
+        state = get_state()
+        completed_skills = state.progress.get_completed(user_id)
+        if completed_skills is None:
             return jsonify({
                 "success": False,
                 "error": "User not found"
             }), 404
         
-        completed_skills = student_progress[user_id]
+        graph = state.graph
         points = calculate_points(completed_skills)
         badge_ids = calculate_badges(completed_skills)
         
@@ -180,11 +318,43 @@ def get_user_summary(user_id):
             "points": points,
             "badges": badges,
             "total_skills": len(graph.get_all_skills()),
-            "progress_percentage": round((len(completed_skills) / len(graph.get_all_skills())) * 100, 1)
+            "progress_percentage": round((len(completed_skills) / len(graph.get_all_skills())) * 100, 1),
+            "activity": state.progress.activity.get_summary(user_id)
         }), 200
         
     except Exception as e:
         return jsonify({
             "success": False,
             "error": str(e)
-        }), 500 
\ No newline at end of file
+        }), 500
+
+@skills_bp.route("/trending", methods=["GET"])
+def get_trending_skills():
+    """Get the most completed skills over the recent rolling window"""
+    limit = request.args.get("limit", 5, type=int)
+    if limit < 1:
+        return jsonify({
+            "success": False,
+            "error": "limit must be at least 1"
+        }), 400
+    limit = min(limit, MAX_TRENDING_LIMIT)
+    state = get_state()
+    trending = []
+    for skill_id, completions in state.progress.activity.get_trending(limit):
+        skill = state.graph.get_skill(skill_id)
+        trending.append({
+            "id": skill_id,
+            "name": skill.name if skill else skill_id,
+            "completions": completions
+        })
+    return jsonify({"success": True, "trending": trending})
+
+@skills_bp.route("/throttle_stats", methods=["GET"])
+def get_throttle_stats():
+    """Get rate limiting and request coalescing counters"""
+    state = get_state()
+    return jsonify({
+        "success": True,
+        "rate_limiter": state.rate_limiter.stats(),
+        "unlockable_coalescing": state.unlockable_flight.stats()
+    })
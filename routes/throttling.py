@@ -0,0 +1,149 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class TokenBucketLimiter:
+    """In-process token-bucket rate limiter with one bucket per key"""
+
+    def __init__(self, capacity: float = 20, refill_rate: float = 10,
+                 kind_limits: Optional[Dict[Hashable, Tuple[float, float]]] = None,
+                 sweep_interval: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            capacity: Maximum burst size per key
+            refill_rate: Tokens added back per second
+            kind_limits: (capacity, refill_rate) overrides for tuple keys,
+                looked up by their first element, e.g. {"ip": (200, 100)}
+            sweep_interval: Seconds between sweeps dropping buckets that have
+                refilled completely (defaults to the longest time to refill
+                from empty)
+            clock: Monotonic time source, replaceable in tests
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.kind_limits = dict(kind_limits or {})
+        if sweep_interval is None:
+            sweep_interval = max(cap / rate for cap, rate in [(capacity, refill_rate), *self.kind_limits.values()])
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+        self._last_sweep = clock()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def _limits(self, key: Hashable) -> Tuple[float, float]:
+        """(capacity, refill_rate) of the bucket for a key"""
+        if isinstance(key, tuple) and key and key[0] in self.kind_limits:
+            return self.kind_limits[key[0]]
+        return self.capacity, self.refill_rate
+
+    def _level(self, key: Hashable, now: float) -> float:
+        """Current token count of a bucket (full for an unknown key)"""
+        capacity, refill_rate = self._limits(key)
+        tokens, last = self._buckets.get(key, (capacity, now))
+        return min(capacity, tokens + (now - last) * refill_rate)
+
+    def _sweep(self, now: float) -> None:
+        """Drop buckets that are full again; they behave like unknown keys"""
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items()
+            if self._level(key, now) < self._limits(key)[0]
+        }
+
+    def allow(self, *keys: Hashable) -> bool:
+        """
+        Take one token from each key's bucket
+
+        The request is allowed only if every bucket has a token, and tokens
+        are taken only when it is. Rejected requests never create buckets,
+        so rotating keys cannot grow the table faster than the other keys
+        allow.
+
+        Args:
+            keys: Bucket keys that must all allow the request,
+                e.g. ("ip", ip) and ("user", user_id)
+
+        Returns:
+            True if the request may proceed, False if it should be rejected
+        """
+        with self._lock:
+            now = self._clock()
+            self._sweep(now)
+            levels = [self._level(key, now) for key in keys]
+            if all(level >= 1 for level in levels):
+                for key, level in zip(keys, levels):
+                    self._buckets[key] = (level - 1, now)
+                self.allowed += 1
+                return True
+            for key, level in zip(keys, levels):
+                if key in self._buckets:
+                    self._buckets[key] = (level, now)
+            self.rejected += 1
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        """Get allowed/rejected counters"""
+        return {"allowed": self.allowed, "rejected": self.rejected, "keys": len(self._buckets)}
+
+class _Call:
+    """An in-flight computation shared by concurrent callers"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into a single computation"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for an identical call already in flight
+
+        Args:
+            key: Identity of the call; callers with equal keys share a result
+            fn: Zero-argument function computing the result
+
+        Returns:
+            The result of fn (possibly computed by another caller)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        """Get executed/coalesced counters"""
+        return {"executed": self.executed, "coalesced": self.coalesced}
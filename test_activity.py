@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the ActivityTracker module
+"""
+
+import threading
+
+from models.activity import ActivityTracker, SECONDS_PER_DAY
+from models.progress_store import ProgressStore
+
+def test_activity():
+    """Test streaks, windowed points and trending skills"""
+    print("=== Activity Tracker Test ===\n")
+    tracker = ActivityTracker(trending_days=7)
+    day = 20000 * SECONDS_PER_DAY
+
+    # Test 1: Streak over consecutive days
+    print("1. Completions on three consecutive days:")
+    for offset, skill_id in enumerate(["basics", "ms_office", "canva"]):
+        tracker.record_completion("alice", skill_id, 50, day + offset * SECONDS_PER_DAY)
+    summary = tracker.get_summary("alice", now=day + 2 * SECONDS_PER_DAY)
+    print(f"   Current streak: {summary['current_streak']}")
+    print(f"   Points last 7 days: {summary['points_last_7_days']}")
+    assert summary["current_streak"] == 3
+    assert summary["points_last_7_days"] == 150
+    # Per-skill timestamps are returned by /progress, not the summary
+    assert "completed_at" not in summary
+    print()
+
+    # Test 2: A missed day resets the current streak
+    print("2. Summary after a missed day:")
+    summary = tracker.get_summary("alice", now=day + 4 * SECONDS_PER_DAY)
+    print(f"   Current streak: {summary['current_streak']}")
+    print(f"   Longest streak: {summary['longest_streak']}")
+    assert summary["current_streak"] == 0
+    assert summary["longest_streak"] == 3
+    print()
+
+    # Test 3: Old buckets fall out of the window
+    print("3. Points 40 days later:")
+    summary = tracker.get_summary("alice", now=day + 40 * SECONDS_PER_DAY)
+    print(f"   Points last 7 days: {summary['points_last_7_days']}")
+    print(f"   Skills last 30 days: {summary['skills_last_30_days']}")
+    assert summary["points_last_7_days"] == 0
+    assert summary["skills_last_30_days"] == 0
+    print()
+
+    # Test 4: Trending skills
+    print("4. Trending skills:")
+    tracker.record_completion("bob", "canva", 50, day + 2 * SECONDS_PER_DAY)
+    trending = tracker.get_trending(now=day + 2 * SECONDS_PER_DAY)
+    for skill_id, completions in trending:
+        print(f"   - {skill_id}: {completions}")
+    assert trending[0] == ("canva", 2)
+    assert tracker.get_trending(now=day + 30 * SECONDS_PER_DAY) == []
+    print()
+
+    # Test 5: The trending endpoint rejects a non-positive limit
+    print("5. Trending endpoint limits:")
+    from app import create_app
+    client = create_app().test_client()
+    for limit in (-1, 0, 1000):
+        response = client.get(f"/trending?limit={limit}")
+        print(f"   limit={limit}: {response.status_code}")
+        assert response.status_code == (200 if limit > 0 else 400)
+    print()
+
+def test_progress_store():
+    """Test that overlapping completions of one skill are recorded once"""
+    print("=== Progress Store Test ===\n")
+    store = ProgressStore()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def complete():
+        barrier.wait()
+        results.append(store.record_completion("carol", "basics", 50))
+
+    print("1. Eight overlapping completions of the same skill:")
+    threads = [threading.Thread(target=complete) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    recorded = [result for result in results if result is not None]
+    summary = store.activity.get_summary("carol")
+    print(f"   Recorded: {len(recorded)}")
+    print(f"   Completed skills: {store.get_completed('carol')}")
+    print(f"   Points today: {summary['points_today']}")
+    assert len(recorded) == 1
+    assert store.get_completed("carol") == ["basics"]
+    assert store.get_version("carol") == 1
+    assert summary["points_today"] == 50
+    print()
+
+if __name__ == "__main__":
+    test_activity()
+    test_progress_store()
@@ -3,7 +3,7 @@
 Test script for the SkillGraph module
 """
 
-from models.skill_graph import skill_graph
+from models.skill_graph import SkillGraph, skill_graph
 
 def test_skill_graph():
     """Test the skill graph functionality"""
@@ -80,6 +80,63 @@ def test_skill_graph():
     except ValueError as e:
         print(f"   Error: {e}")
     print()
+    
+    # Test 9: Validate the graph structure
+    print("9. Validating graph structure:")
+    report = skill_graph.validate()
+    print(f"   Valid: {report.is_valid}")
+    print(f"   Components: {report.components}")
+    print(f"   Cycles: {report.cycles}")
+    print(f"   Redundant edges: {report.redundant_edges}")
+    assert report.is_valid
+    print()
+    
+    # Test 10: Detect cycles and duplicates in an imported catalog
+    print("10. Validating a broken catalog:")
+    broken = SkillGraph()
+    broken.add_skill("canva", "Canva", "Redefined design basics", ["basics_computer"])
+    # add_skill() cannot create a cycle, so edit the edge in place; this
+    # graph does not cache a reduction, so validate() sees the change
+    broken.skills["basics_computer"].prerequisites.append("ai_tools")
+    report = broken.validate()
+    print(f"   Cycles: {report.cycles}")
+    print(f"   Unreachable: {report.unreachable}")
+    print(f"   Shadowed: {report.shadowed}")
+    assert not report.is_valid
+    assert report.shadowed == ["canva"]
+    print()
+    
+    # Test 11: The catalog served by the API validates cleanly
+    print("11. Validating the shipped catalog:")
+    from routes.skills import build_skill_graph
+    report = build_skill_graph().validate()
+    print(f"   Valid: {report.is_valid}")
+    print(f"   Duplicates: {report.duplicates}")
+    print(f"   Shadowed names: {report.shadowed_names}")
+    assert report.is_valid
+    assert not report.duplicates and not report.shadowed and not report.shadowed_names
+    assert not report.orphaned
+    print()
+    
+    # Test 12: Reduced prerequisites only apply to closed completed sets
+    print("12. Unlocking with reduced prerequisites:")
+    reduced = SkillGraph(reduce_prerequisites=True, load_sample_data=False)
+    reduced.add_skill("a", "A", "First skill")
+    reduced.add_skill("b", "B", "Requires A", ["a"])
+    reduced.add_skill("c", "C", "Requires A and B", ["a", "b"])
+    print(f"   Reduced edges: {reduced.get_unlock_edges()}")
+    assert reduced.get_unlock_edges()["c"] == ["b"]
+    assert reduced.get_all_skills()[2].prerequisites == ["a", "b"]
+    # "b" without "a" is not closed, so "c" must stay locked
+    unlockable = [skill.id for skill in reduced.get_unlockable_skills(["b"])]
+    print(f"   Unlockable after ['b']: {unlockable}")
+    assert unlockable == ["a"]
+    assert not reduced.can_unlock("c", ["b"])
+    unlockable = [skill.id for skill in reduced.get_unlockable_skills(["a", "b"], closed=True)]
+    print(f"   Unlockable after ['a', 'b']: {unlockable}")
+    assert unlockable == ["c"]
+    assert reduced.can_unlock("c", ["a", "b"], closed=True)
+    print()
 
 if __name__ == "__main__":
     test_skill_graph() 
\ No newline at end of file
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script for rate limiting and request coalescing
+"""
+
+import threading
+import time
+
+from app import create_app
+from routes.skills import get_state, resolve_completed
+from routes.throttling import TokenBucketLimiter, SingleFlight
+
+class FakeClock:
+    """Manually advanced time source"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_token_bucket():
+    """Test rejecting, refilling and evicting buckets"""
+    print("=== Token Bucket Test ===\n")
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(capacity=2, refill_rate=1, clock=clock)
+
+    # Test 1: Burst up to capacity, then reject
+    print("1. Three requests with capacity 2:")
+    results = [limiter.allow("a") for _ in range(3)]
+    print(f"   Results: {results}")
+    assert results == [True, True, False]
+    print()
+
+    # Test 2: Tokens refill over time
+    print("2. One second later:")
+    clock.now += 1
+    results = [limiter.allow("a") for _ in range(2)]
+    print(f"   Results: {results}")
+    assert results == [True, False]
+    print()
+
+    # Test 3: Every key must allow the request
+    print("3. Shared IP bucket with rotating users:")
+    results = [limiter.allow(("ip", "1.2.3.4"), ("user", f"u{i}")) for i in range(10)]
+    print(f"   Results: {results}")
+    print(f"   Stats: {limiter.stats()}")
+    assert results == [True, True] + [False] * 8
+    # Only the two allowed users got buckets
+    assert limiter.stats()["keys"] == 4
+    print()
+
+    # Test 4: Buckets that refilled completely are swept
+    print("4. Buckets after they have refilled:")
+    clock.now += 10
+    limiter.allow("b")
+    print(f"   Stats: {limiter.stats()}")
+    assert limiter.stats()["keys"] == 1
+    print()
+
+    # Test 5: Key kinds can have their own limits
+    print("5. Larger limit for IP keys:")
+    limiter = TokenBucketLimiter(capacity=1, refill_rate=1, kind_limits={"ip": (3, 1)}, clock=clock)
+    results = [limiter.allow(("ip", "1.2.3.4")) for _ in range(4)]
+    print(f"   Results: {results}")
+    assert results == [True, True, True, False]
+    print()
+
+def test_single_flight():
+    """Test sharing results and errors between concurrent callers"""
+    print("=== Single Flight Test ===\n")
+    flight = SingleFlight()
+
+    # Test 1: Followers share the leader's result
+    print("1. Concurrent calls with the same key:")
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait()
+        return ["shared"]
+
+    leader = threading.Thread(target=lambda: results.append(flight.do("key", slow)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flight.do("key", slow))) for _ in range(3)]
+    for t in followers:
+        t.start()
+    while flight.stats()["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader] + followers:
+        t.join()
+    print(f"   Stats: {flight.stats()}")
+    assert flight.stats() == {"executed": 1, "coalesced": 3}
+    assert all(result is results[0] for result in results)
+    print()
+
+    # Test 2: A failing leader raises in every follower
+    print("2. Error propagation:")
+    started.clear()
+    release.clear()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait()
+        raise RuntimeError("scan failed")
+
+    def call():
+        try:
+            flight.do("error", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    while flight.stats()["coalesced"] < 4:
+        time.sleep(0.001)
+    release.set()
+    leader.join()
+    follower.join()
+    print(f"   Errors: {errors}")
+    assert errors == ["scan failed", "scan failed"]
+    print()
+
+def test_unlockable_endpoint():
+    """Test coalescing keys and request validation on /unlockable"""
+    print("=== Unlockable Endpoint Test ===\n")
+    app = create_app({
+        "RATE_LIMIT_CAPACITY": 2, "RATE_LIMIT_REFILL": 0.001,
+        "RATE_LIMIT_IP_CAPACITY": 2, "RATE_LIMIT_IP_REFILL": 0.001,
+    })
+    client = app.test_client()
+
+    # Test 1: A completion bumps the version in the coalescing key
+    print("1. Coalescing key before and after a completion:")
+    with app.app_context():
+        state = get_state()
+        state.progress.record_completion("alice", "basics", 50)
+        _, before, closed = resolve_completed(state, "alice", [])
+        state.progress.record_completion("alice", "canva", 50)
+        _, after, _ = resolve_completed(state, "alice", [])
+    print(f"   Before: {before}")
+    print(f"   After: {after}")
+    assert closed and before != after
+    print()
+
+    # Test 2: Malformed completed_skills is rejected
+    print("2. Malformed completed_skills:")
+    response = client.post("/unlockable", json={"completed_skills": [["x"]]})
+    print(f"   Status: {response.status_code}")
+    assert response.status_code == 400
+    print()
+
+    # Test 3: Bodies that are not JSON objects, and non-string IDs
+    print("3. Malformed request bodies:")
+    requests_to_check = [
+        ("/unlockable", {"json": [1]}),
+        ("/unlockable", {"data": "not json"}),
+        ("/unlockable", {}),
+        ("/progress", {"json": [1]}),
+        ("/progress", {}),
+        ("/progress", {"json": {"user_id": {"a": 1}, "skill_id": "basics"}}),
+        ("/progress", {"json": {"user_id": "bob", "skill_id": ["basics"]}}),
+    ]
+    for path, kwargs in requests_to_check:
+        response = client.post(path, **kwargs)
+        print(f"   {path} {kwargs}: {response.status_code}")
+        assert response.status_code == 400
+    print()
+
+    # Test 4: Rotating user_id does not bypass the per-IP limit
+    print("4. Rotating user_id values:")
+    codes = [
+        client.post("/unlockable", json={"user_id": f"u{i}"}).status_code
+        for i in range(10)
+    ]
+    print(f"   Status codes: {codes}")
+    assert codes == [200, 200] + [429] * 8
+    print()
+
+    # Test 5: Users sharing one IP each get their own limit
+    print("5. Four users behind one IP:")
+    app = create_app({
+        "RATE_LIMIT_CAPACITY": 2, "RATE_LIMIT_REFILL": 0.001,
+        "RATE_LIMIT_IP_CAPACITY": 10, "RATE_LIMIT_IP_REFILL": 0.001,
+    })
+    client = app.test_client()
+    codes = {
+        user_id: [client.post("/unlockable", json={"user_id": user_id}).status_code for _ in range(3)]
+        for user_id in ("u0", "u1", "u2", "u3")
+    }
+    print(f"   Status codes: {codes}")
+    # Each user gets its own two requests; only the third is over its limit
+    assert all(user_codes == [200, 200, 429] for user_codes in codes.values())
+    print()
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_single_flight()
+    test_unlockable_endpoint()